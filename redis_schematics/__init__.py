@@ -9,8 +9,8 @@ a relational database.
 
 from __future__ import absolute_import
 
+import sys
 import uuid
-import json
 
 from schematics import models, types
 from redis_schematics.exceptions import (
@@ -18,7 +18,14 @@ from redis_schematics.exceptions import (
     MultipleFound,
     StrictPerformanceException,
 )
-from redis_schematics.utils import group_filters_by_suffix, match_filters
+from redis_schematics.serializers import json_deserializer, json_serializer
+from redis_schematics.utils import (
+    SCAN_COUNT,
+    chunks,
+    group_filters_by_suffix,
+    match_filters,
+    match_filters_vectorized,
+)
 
 
 class BaseRedisMixin(object):
@@ -35,15 +42,73 @@ class BaseRedisMixin(object):
     __unique_args__ = None
     __strict_performance__ = False
 
+    __trusted_source__ = False
+    """Trust data read by refresh(), refresh_many(), match_for_pk() and
+    match_for_pks() as written by set(). Fields are converted directly into the
+    instance, opting out of schema validation."""
+
+    __cluster_hashtag__ = False
+    """Wrap the prefix on a hash tag, such as ``{Prefix}:pk``, so every key of the
+    class lives on the same Redis Cluster slot."""
+
+    _key_prefix = None
+    """Keys prefix, when it does not depend on the instance. Computed once on
+    class creation."""
+
+    _scan_pattern = None
+    """Pattern matching every key of the class, when it does not depend on the
+    instance. Computed once on class creation."""
+
+    _compound_fields = None
+    """Whether the schema holds compound fields. Computed once per class, on the
+    first import from storage, since schematics builds the schema after
+    __init_subclass__ runs."""
+
+    def __init_subclass__(cls, **kwargs):
+        super(BaseRedisMixin, cls).__init_subclass__(**kwargs)
+        cls._compound_fields = None
+
+        if (
+            cls.__prefix__ is BaseRedisMixin.__prefix__
+            and cls.__key_pattern__ is BaseRedisMixin.__key_pattern__
+        ):
+            cls._key_prefix = sys.intern(cls._tag_prefix(cls.__name__))
+            cls._scan_pattern = cls._key_prefix + ":*"
+        else:
+            cls._key_prefix = None
+            cls._scan_pattern = None
+
+    @classmethod
+    def _tag_prefix(cls, prefix):
+        """Wraps a prefix on a hash tag when __cluster_hashtag__ is set."""
+        if cls.__cluster_hashtag__:
+            return "{" + prefix + "}"
+
+        return prefix
+
+    @classmethod
+    def _make_key(cls, *args):
+        """Builds a key from the class prefix, without an instance. Only for
+        classes whose prefix does not depend on the instance."""
+        if cls._key_prefix is None:
+            raise TypeError(
+                "{} overrides __prefix__ or __key_pattern__, its keys must be "
+                "built with __key_pattern__.".format(cls.__name__)
+            )
+
+        return ":".join((cls._key_prefix,) + args)
+
     @staticmethod
     def __serializer__(obj):
-        """Method used to serialize to string prior to dumping complex objects."""
-        return json.dumps(obj)
+        """Method used to serialize to string prior to dumping complex objects.
+        See redis_schematics.serializers for alternatives."""
+        return json_serializer(obj)
 
     @staticmethod
     def __deserializer__(dump):
-        """Method used to deserialize to string prior to loading complex objects."""
-        return json.loads(dump)
+        """Method used to deserialize to string prior to loading complex objects.
+        See redis_schematics.serializers for alternatives."""
+        return json_deserializer(dump)
 
     @property
     def key(self):
@@ -70,16 +135,85 @@ class BaseRedisMixin(object):
 
     def __key_pattern__(self, *args):
         """Pattern used to build a key or a query for a given object."""
+        if self._key_prefix is not None:
+            return self._make_key(*args)
+
         namespace = []
 
         if self.__prefix__:
-            namespace.append(self.__prefix__)
+            namespace.append(self._tag_prefix(self.__prefix__))
 
         if args:
             namespace += list(args)
 
         return ":".join(namespace)
 
+    @classmethod
+    def _pks_keys(cls, pks):
+        """Builds the keys of several primary keys, without an instance per key."""
+        if cls._key_prefix is not None:
+            return [cls._make_key(str(pk)) for pk in pks]
+
+        key_pattern = cls().__key_pattern__
+        return [key_pattern(str(pk)) for pk in pks]
+
+    @classmethod
+    def _has_compound_fields(cls):
+        """Whether the schema holds compound fields, computed once per class."""
+        if cls._compound_fields is None:
+            cls._compound_fields = any(
+                isinstance(field, types.CompoundType)
+                for field in cls._schema.fields.values()
+            )
+
+        return cls._compound_fields
+
+    def _import_stored(self, data):
+        """
+        Imports data loaded from storage into the instance. With
+        __trusted_source__, each field is converted straight into the instance
+        data, skipping the schematics import loop. Models with compound fields
+        always go through import_data, since those need a conversion context.
+        """
+        if not self.__trusted_source__ or self._has_compound_fields():
+            return self.import_data(data)
+
+        fields = self._schema.fields
+        converted = {}
+
+        for name, field in fields.items():
+            key = field.serialized_name or name
+
+            if key in data:
+                value = data[key]
+                converted[name] = None if value is None else field.to_native(value)
+
+        self._data.converted.update(converted)
+        return self
+
+    @classmethod
+    def _filter_rows(cls, rows, predicates):
+        """
+        Builds schema instances from deserialized rows matching predicates.
+        Numeric predicates are evaluated column-wise with numpy when it is
+        installed, so only matching rows are imported into schema instances.
+        """
+        fields = cls._schema.fields
+        vectorizable = all(
+            isinstance(fields.get(attribute), types.NumberType)
+            and fields[attribute].serialized_name in (None, attribute)
+            for _, attribute, _ in predicates
+        )
+
+        if vectorizable:
+            indexes = match_filters_vectorized(rows, predicates)
+
+            if indexes is not None:
+                return [cls().import_data(rows[i]) for i in indexes]
+
+        objs = [cls().import_data(r) for r in rows]
+        return [obj for obj in objs if match_filters(obj, predicates)]
+
     def __json__(self):
         """
         If you want json serialization, you have at least two options:
@@ -167,7 +301,31 @@ class SimpleRedisMixin(BaseRedisMixin):
             raise NotFound()
 
         obj = schema.__deserializer__(result)
-        return schema.import_data(obj)
+        return schema._import_stored(obj)
+
+    @classmethod
+    def match_for_pks(cls, pks):
+        """
+        Gets elements from storage using their primary keys on a single MGET.
+
+        Args:
+            pks(List(str)): objects primary keys.
+
+        Returns:
+            List(SimpleRedisMixin): Schema object instances, in the same order as
+                pks, with None for missing objects.
+
+        Perfomance: O(n) where n is the number of pks, on a single round trip.
+        """
+        if not pks:
+            return []
+
+        keys = cls._pks_keys(pks)
+        results = cls.__redis_client__.mget(keys)
+        return [
+            cls()._import_stored(cls.__deserializer__(r)) if r is not None else None
+            for r in results
+        ]
 
     @classmethod
     def match_for_values(cls, **kwargs):
@@ -204,14 +362,22 @@ class SimpleRedisMixin(BaseRedisMixin):
     @classmethod
     def _all_keys(cls):
         """
-        Gets all the keys from elements on the storage.
+        Gets all the keys from elements on the storage. Uses KEYS instead of a
+        single SCAN call, since a SCAN page is not guaranteed to hold every key.
+        With __strict_performance__, KEYS is never used and the whole keyspace is
+        iterated with SCAN instead, so the server is not blocked.
 
         Returns:
             List(str): Schema object instances.
 
         Perfomance: O(n) where n is the size of the database.
         """
-        pattern = cls().__key_pattern__("*")
+        pattern = cls._scan_pattern or cls().__key_pattern__("*")
+
+        if cls.__strict_performance__:
+            scan = cls.__redis_client__.scan_iter(match=pattern, count=SCAN_COUNT)
+            return list(set(scan))
+
         return cls.__redis_client__.keys(pattern)
 
     @classmethod
@@ -231,13 +397,26 @@ class SimpleRedisMixin(BaseRedisMixin):
         if cls.__strict_performance__:
             raise StrictPerformanceException()
 
+        return [cls().import_data(r) for r in cls._all_raw()]
+
+    @classmethod
+    def _all_raw(cls):
+        """
+        Gets all elements from storage as deserialized dicts.
+
+        Returns:
+            List(dict): Deserialized objects.
+
+        Perfomance: O(n) where n is the size of the database.
+        """
         keys = cls._all_keys()
 
         if not keys:
             return []
 
         results = cls.__redis_client__.mget(*keys)
-        return [cls().import_data(cls.__deserializer__(r)) for r in results]
+        deserialize = cls.__deserializer__
+        return [deserialize(r) for r in results]
 
     @classmethod
     def filter(cls, **kwargs):
@@ -261,8 +440,8 @@ class SimpleRedisMixin(BaseRedisMixin):
         if cls.__strict_performance__:
             raise StrictPerformanceException()
 
-        filter_group = group_filters_by_suffix(kwargs)
-        return [r for r in cls.all() if match_filters(r, filter_group)]
+        predicates = group_filters_by_suffix(kwargs)
+        return cls._filter_rows(cls._all_raw(), predicates)
 
     @classmethod
     def delete_all(cls, **kwargs):
@@ -279,7 +458,7 @@ class SimpleRedisMixin(BaseRedisMixin):
         if not keys:
             return 0
 
-        return cls.__redis_client__.delete(*keys)
+        return cls._pipeline_delete(keys)
 
     @classmethod
     def delete_filter(cls, **kwargs):
@@ -299,18 +478,76 @@ class SimpleRedisMixin(BaseRedisMixin):
         if not keys:
             return 0
 
-        return cls.__redis_client__.delete(*keys)
+        return cls._pipeline_delete(keys)
+
+    @classmethod
+    def _pipeline_delete(cls, keys):
+        """
+        Deletes keys from storage in chunks sent over a single pipeline. Keys
+        are removed with UNLINK, so their memory is reclaimed in the background.
+
+        Returns:
+            int: Number of deleted elements.
 
-    def set(self):
+        Perfomance: O(n) where n is the number of keys.
+        """
+        with cls.__redis_client__.pipeline(transaction=False) as pipe:
+            for chunk in chunks(keys):
+                pipe.unlink(*chunk)
+
+            return sum(pipe.execute())
+
+    def set(self, pipe=None):
         """
         Sets the element on storage.
 
+        Args:
+            pipe(redis.client.Pipeline): optional pipeline to queue the command
+                on, instead of sending it. The caller must execute it.
+
+        Perfomance: O(1)
+        """
+        self._queue_set(self.__redis_client__ if pipe is None else pipe)
+
+    @classmethod
+    def set_many(cls, objs):
+        """
+        Sets elements on storage using a single pipeline.
+
+        Args:
+            objs(List(SimpleRedisMixin)): objects to set.
+
+        Perfomance: O(n) where n is the number of objects, on a single round trip.
+        """
+        with cls.__redis_client__.pipeline(transaction=False) as pipe:
+            for obj in objs:
+                obj._queue_set(pipe)
+
+            pipe.execute()
+
+    @classmethod
+    def set_raw(cls, pk, blob):
+        """
+        Sets an already serialized element on storage, skipping to_primitive and
+        the serializer. The blob must be what __serializer__ would write.
+
+        Args:
+            pk(str): primary key of the element.
+            blob(bytes): serialized element.
+
         Perfomance: O(1)
         """
-        self.pk = self.__primary_key__ or str(uuid.uuid4)
+        cls.__redis_client__.set(cls().__key_pattern__(pk), blob, ex=cls.__expire__)
+
+    def _queue_set(self, pipe):
+        """Sends the element SET through a client or queues it on a pipeline."""
+        pk = self.__primary_key__ or uuid.uuid4().hex
+        self.pk = pk
 
-        self.__redis_client__.set(
-            self.key, self.__serializer__(self.to_primitive()), self.__expire__
+        pipe.set(
+            self.__key_pattern__(pk),
+            self.__serializer__(self.to_primitive()),
+            ex=self.__expire__,
         )
 
     def refresh(self):
@@ -327,7 +564,31 @@ class SimpleRedisMixin(BaseRedisMixin):
         if result is None:
             raise NotFound()
 
-        self.import_data(self.__deserializer__(result))
+        self._import_stored(self.__deserializer__(result))
+
+    @classmethod
+    def refresh_many(cls, objs):
+        """
+        Updates objects from storage using a single MGET.
+
+        Args:
+            objs(List(SimpleRedisMixin)): objects to update.
+
+        Raises:
+            (NotFound): An object was deleted meanwhile.
+
+        Perfomance: O(n) where n is the number of objects.
+        """
+        if not objs:
+            return
+
+        results = cls.__redis_client__.mget([obj.key for obj in objs])
+
+        if None in results:
+            raise NotFound()
+
+        for obj, result in zip(objs, results):
+            obj._import_stored(cls.__deserializer__(result))
 
     def delete(self):
         """
@@ -354,10 +615,34 @@ class HashRedisMixin(BaseRedisMixin):
     non primary key operations.
     """
 
+    __max_bulk__ = None
+    """Maximum number of elements fetched by all() and filter().
+    Default(None) is no limit."""
+
+    _set_key = None
+    """Hash key of the class, when it does not depend on the instance. Computed
+    once on class creation."""
+
+    def __init_subclass__(cls, **kwargs):
+        super(HashRedisMixin, cls).__init_subclass__(**kwargs)
+
+        if (
+            cls._key_prefix is not None
+            and cls.__set_key__ is HashRedisMixin.__set_key__
+        ):
+            cls._set_key = cls._key_prefix
+        else:
+            cls._set_key = None
+
     @property
     def __set_key__(self):
         return self.__key_pattern__()
 
+    @classmethod
+    def _class_set_key(cls):
+        """Hash key for the class, avoiding an instance when possible."""
+        return cls._set_key or cls().__set_key__
+
     @classmethod
     def match(cls, **kwargs):
         """
@@ -413,7 +698,31 @@ class HashRedisMixin(BaseRedisMixin):
             raise NotFound()
 
         obj = schema.__deserializer__(result)
-        return schema.import_data(obj)
+        return schema._import_stored(obj)
+
+    @classmethod
+    def match_for_pks(cls, pks):
+        """
+        Gets elements from storage using their primary keys on a single HMGET.
+
+        Args:
+            pks(List(str)): objects primary keys.
+
+        Returns:
+            List(HashRedisMixin): Schema object instances, in the same order as
+                pks, with None for missing objects.
+
+        Perfomance: O(n) where n is the number of pks, on a single round trip.
+        """
+        if not pks:
+            return []
+
+        keys = cls._pks_keys(pks)
+        results = cls.__redis_client__.hmget(cls._class_set_key(), keys)
+        return [
+            cls()._import_stored(cls.__deserializer__(r)) if r is not None else None
+            for r in results
+        ]
 
     @classmethod
     def match_for_values(cls, **kwargs):
@@ -457,22 +766,67 @@ class HashRedisMixin(BaseRedisMixin):
 
         Perfomance: O(n) where n is the number of elements.
         """
-        schema = cls()
-        return cls.__redis_client__.hgetall(schema.__set_key__).keys()
+        return cls.__redis_client__.hkeys(cls._class_set_key())
 
     @classmethod
-    def all(cls):
+    def all(cls, chunk_size=SCAN_COUNT):
         """
         Gets all elements from storage.
 
+        Args:
+            chunk_size(int): number of elements hinted to each HSCAN call. When
+                None, the whole hash is read with a single HGETALL.
+
         Returns:
-            List(SimpleRedisMixin): Schema object instances.
+            List(HashRedisMixin): Schema object instances.
+
+        Raises:
+            (StrictPerformanceException): Low performance query not allowed by the
+                current configuration.
 
         Perfomance: O(n) where n is the number of elements.
         """
-        schema = cls()
-        results = cls.__redis_client__.hgetall(schema.__set_key__).values()
-        return [cls().import_data(cls.__deserializer__(r)) for r in results]
+        if cls.__strict_performance__:
+            raise StrictPerformanceException()
+
+        return [cls().import_data(r) for r in cls._all_raw(chunk_size)]
+
+    @classmethod
+    def _all_raw(cls, chunk_size=SCAN_COUNT):
+        """
+        Gets all elements from storage as deserialized dicts. Elements are
+        fetched with HSCAN, so large hashes don't block the server on a single
+        command, or with a single HGETALL when chunk_size is None.
+
+        Returns:
+            List(dict): Deserialized objects.
+
+        Raises:
+            (StrictPerformanceException): The hash holds more elements than
+                __max_bulk__.
+
+        Perfomance: O(n) where n is the number of elements.
+        """
+        set_key = cls._class_set_key()
+
+        if cls.__max_bulk__ is not None:
+            size = cls.__redis_client__.hlen(set_key)
+
+            if size > cls.__max_bulk__:
+                raise StrictPerformanceException(
+                    "{} holds {} elements, over __max_bulk__ of {}.".format(
+                        set_key, size, cls.__max_bulk__
+                    )
+                )
+
+        if chunk_size is None:
+            results = cls.__redis_client__.hgetall(set_key).values()
+        else:
+            scan = cls.__redis_client__.hscan_iter(set_key, count=chunk_size)
+            results = dict(scan).values()
+
+        deserialize = cls.__deserializer__
+        return [deserialize(r) for r in results]
 
     @classmethod
     def filter(cls, **kwargs):
@@ -496,21 +850,21 @@ class HashRedisMixin(BaseRedisMixin):
         if cls.__strict_performance__:
             raise StrictPerformanceException()
 
-        filter_group = group_filters_by_suffix(kwargs)
-        return [r for r in cls.all() if match_filters(r, filter_group)]
+        predicates = group_filters_by_suffix(kwargs)
+        return cls._filter_rows(cls._all_raw(), predicates)
 
     @classmethod
     def delete_all(cls, **kwargs):
         """
-        Deletes all elements from storage.
+        Deletes all elements from storage. The hash is removed with UNLINK, so
+        its memory is reclaimed in the background instead of blocking the server.
 
         Returns:
             int: Number of deleted elements.
 
         Perfomance: O(1).
         """
-        schema = cls()
-        return cls.__redis_client__.delete(schema.__set_key__)
+        return cls.__redis_client__.unlink(cls._class_set_key())
 
     @classmethod
     def delete_filter(cls, **kwargs):
@@ -530,21 +884,101 @@ class HashRedisMixin(BaseRedisMixin):
         if not keys:
             return 0
 
-        schema = cls()
-        return cls.__redis_client__.hdel(schema.__set_key__, *keys)
+        return cls._pipeline_hdel(cls._class_set_key(), keys)
 
-    def set(self):
+    @classmethod
+    def _pipeline_hdel(cls, set_key, keys):
         """
-        Sets the element on storage.
+        Deletes keys from a storage hash in chunks sent over a single pipeline.
+
+        Returns:
+            int: Number of deleted elements.
+
+        Perfomance: O(n) where n is the number of keys.
+        """
+        with cls.__redis_client__.pipeline(transaction=False) as pipe:
+            for chunk in chunks(keys):
+                pipe.hdel(set_key, *chunk)
+
+            return sum(pipe.execute())
+
+    def set(self, pipe=None):
+        """
+        Sets the element on storage, refreshing the hash expire on the same
+        round trip.
+
+        Args:
+            pipe(redis.client.Pipeline): optional pipeline to queue the commands
+                on, instead of sending them. The caller must execute it.
+
+        Perfomance: O(1)
+        """
+        if pipe is None:
+            with self.__redis_client__.pipeline(transaction=False) as pipe:
+                self.set(pipe)
+                pipe.execute()
+
+            return
+
+        set_key = self._queue_set(pipe)
+
+        if self.__expire__ is not None:
+            pipe.expire(set_key, self.__expire__)
+
+    @classmethod
+    def set_many(cls, objs):
+        """
+        Sets elements on storage using a single pipeline, refreshing the expire
+        of each hash once.
+
+        Args:
+            objs(List(HashRedisMixin)): objects to set.
+
+        Perfomance: O(n) where n is the number of objects, on a single round trip.
+        """
+        with cls.__redis_client__.pipeline(transaction=False) as pipe:
+            set_keys = set(obj._queue_set(pipe) for obj in objs)
+
+            if cls.__expire__ is not None:
+                for set_key in set_keys:
+                    pipe.expire(set_key, cls.__expire__)
+
+            pipe.execute()
+
+    @classmethod
+    def set_raw(cls, pk, blob):
+        """
+        Sets an already serialized element on storage, skipping to_primitive and
+        the serializer. The blob must be what __serializer__ would write.
+
+        Args:
+            pk(str): primary key of the element.
+            blob(bytes): serialized element.
 
         Perfomance: O(1)
         """
-        self.pk = self.__primary_key__ or str(uuid.uuid4)
+        set_key = cls._class_set_key()
 
-        self.__redis_client__.hset(
-            self.__set_key__, self.key, self.__serializer__(self.to_primitive())
+        with cls.__redis_client__.pipeline(transaction=False) as pipe:
+            pipe.hset(set_key, cls().__key_pattern__(pk), blob)
+
+            if cls.__expire__ is not None:
+                pipe.expire(set_key, cls.__expire__)
+
+            pipe.execute()
+
+    def _queue_set(self, pipe):
+        """Queues the element HSET on a pipeline, returning its hash key."""
+        pk = self.__primary_key__ or uuid.uuid4().hex
+        self.pk = pk
+        set_key = self.__set_key__
+
+        pipe.hset(
+            set_key,
+            self.__key_pattern__(pk),
+            self.__serializer__(self.to_primitive()),
         )
-        self.__redis_client__.expire(self.__set_key__, self.__expire__)
+        return set_key
 
     def refresh(self):
         """
@@ -560,7 +994,32 @@ class HashRedisMixin(BaseRedisMixin):
         if result is None:
             raise NotFound()
 
-        self.import_data(self.__deserializer__(result))
+        self._import_stored(self.__deserializer__(result))
+
+    @classmethod
+    def refresh_many(cls, objs):
+        """
+        Updates objects from storage using a single pipeline.
+
+        Args:
+            objs(List(HashRedisMixin)): objects to update.
+
+        Raises:
+            (NotFound): An object was deleted meanwhile.
+
+        Perfomance: O(n) where n is the number of objects.
+        """
+        with cls.__redis_client__.pipeline(transaction=False) as pipe:
+            for obj in objs:
+                pipe.hget(obj.__set_key__, obj.key)
+
+            results = pipe.execute()
+
+        if None in results:
+            raise NotFound()
+
+        for obj, result in zip(objs, results):
+            obj._import_stored(cls.__deserializer__(result))
 
     def delete(self):
         """
@@ -0,0 +1,25 @@
+# encoding: utf8
+
+from __future__ import absolute_import
+
+import redis
+
+
+def configure_pool(url, max_connections=64, **kwargs):
+    """
+    Builds a redis client backed by a blocking connection pool, which is the
+    recommended value for ``__redis_client__``. Connections are reused across
+    calls and threads wait for a free connection instead of opening new ones.
+
+    Args:
+        url(str): redis url, such as ``redis://localhost:6379/0``.
+        max_connections(int): maximum number of open connections.
+        **kwargs: extra arguments for the connection pool.
+
+    Returns:
+        (redis.Redis): Redis client.
+    """
+    pool = redis.BlockingConnectionPool.from_url(
+        url, max_connections=max_connections, **kwargs
+    )
+    return redis.Redis(connection_pool=pool)
@@ -1,3 +1,11 @@
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
 def patch_json():
     """
     Patch json default encoder to globally try to find and call a ``__json__``
@@ -11,3 +19,35 @@ def patch_json():
 
     _default.default = JSONEncoder().default
     JSONEncoder.default = _default
+
+
+def json_default(obj):
+    """
+    Serialize objects through their ``__json__`` method. Use it as ``default``
+    on ``json.dumps`` or ``orjson.dumps`` to serialize models without patching
+    the stdlib encoder.
+    """
+    method = getattr(obj.__class__, "__json__", None)
+
+    if method is None:
+        raise TypeError(
+            "Object of type '{}' is not JSON serializable".format(type(obj).__name__)
+        )
+
+    return method(obj)
+
+
+def json_dumps(obj):
+    """
+    Dump objects, including models, to JSON bytes. Uses orjson when it is
+    installed, which formats datetimes and numpy values natively, falling back
+    to the stdlib json with ``json_default``.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            default=json_default,
+            option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY,
+        )
+
+    return json.dumps(obj, default=json_default).encode()
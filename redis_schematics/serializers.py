@@ -0,0 +1,67 @@
+# encoding: utf8
+
+"""
+Serializers used to dump objects to redis. Any of them can be set on a model
+``__serializer__`` and ``__deserializer__``, such as:
+
+..code::python
+    __serializer__ = staticmethod(msgpack_serializer)
+    __deserializer__ = staticmethod(msgpack_deserializer)
+"""
+
+from __future__ import absolute_import
+
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+
+def json_serializer(obj):
+    """Serializes to JSON using the stdlib json."""
+    return json.dumps(obj)
+
+
+def json_deserializer(dump):
+    """Deserializes JSON using the stdlib json."""
+    return json.loads(dump)
+
+
+def orjson_serializer(obj):
+    """Serializes to JSON bytes using orjson, which is faster than the stdlib
+    json. Integers over 64 bits fall back to the stdlib json. Notice NaN and
+    Infinity floats are stored as null."""
+    try:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    except TypeError:
+        return json.dumps(obj).encode()
+
+
+def orjson_deserializer(dump):
+    """Deserializes JSON using orjson. Objects orjson can't read, such as NaN
+    written by the stdlib json, fall back to the stdlib json."""
+    try:
+        return orjson.loads(dump)
+    except orjson.JSONDecodeError:
+        return json.loads(dump)
+
+
+def msgpack_serializer(obj):
+    """Serializes to msgpack, which is smaller and faster to handle than JSON."""
+    return msgpack.packb(obj, use_bin_type=True)
+
+
+def msgpack_deserializer(dump):
+    """Deserializes msgpack. Objects stored as JSON, before switching a model
+    to msgpack, are still loaded."""
+    if dump[:1] == b"{":
+        return json_deserializer(dump)
+
+    return msgpack.unpackb(dump, raw=False)
@@ -2,40 +2,178 @@
 
 from __future__ import absolute_import
 
+import functools
+import numbers
+import operator
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+BULK_CHUNK_SIZE = 512
+"""Maximum number of arguments sent on a single bulk command."""
+
+SCAN_COUNT = 1000
+"""Number of elements hinted to each SCAN family call."""
+
+
+def _contains(value, reference):
+    return value in reference
+
+
+def _excludes(value, reference):
+    return value not in reference
+
 
 FILTER_OPS = {
-    "__gt": lambda s, r: s > r,
-    "__lt": lambda s, r: s < r,
-    "__gte": lambda s, r: s >= r,
-    "__lte": lambda s, r: s <= r,
-    "__eq": lambda s, r: s == r,
-    "__not": lambda s, r: s != r,
-    "__in": lambda s, r: s in r,
-    "__exclude": lambda s, r: s not in r,
+    "__eq": operator.eq,
+    "__not": operator.ne,
+    "__gt": operator.gt,
+    "__lt": operator.lt,
+    "__gte": operator.ge,
+    "__lte": operator.le,
+    "__in": _contains,
+    "__exclude": _excludes,
 }
+"""Filter operators by suffix, from the cheapest to the most expensive."""
+
+_FILTER_RANK = {suffix: rank for rank, suffix in enumerate(FILTER_OPS)}
 
 
 def group_filters_by_suffix(filters):
+    """
+    Compiles filter arguments into a flat tuple of ``(operator, attribute, value)``
+    predicates, sorted so that the cheapest comparisons run first. Arguments
+    without a known suffix are compared for equality. Compiled filters are cached,
+    unless they hold unhashable values such as lists for ``__in``.
+    """
+    items = tuple(sorted(filters.items(), key=operator.itemgetter(0)))
+
+    try:
+        return _compile_filters(items)
+    except TypeError:
+        return _compile_filters.__wrapped__(items)
+
 
-    used = {}
+@functools.lru_cache(maxsize=1024)
+def _compile_filters(items):
+    predicates = []
 
-    def get_suffix(suffix):
-        suffixed = {k: v for k, v in filters.items() if k.endswith(suffix)}
-        cleaned = {k.replace(suffix, ""): v for k, v in suffixed.items()}
-        used.update(suffixed)
-        return cleaned
+    for key, value in items:
+        attribute, sep, suffix = key.rpartition("__")
+        suffix = sep + suffix
 
-    filter_group = {k: get_suffix(k) for k in FILTER_OPS}
-    filter_group["__eq"].update(**{k: v for k, v in filters.items() if k not in used})
-    return filter_group
+        if not attribute or suffix not in FILTER_OPS:
+            attribute, suffix = key, "__eq"
 
+        predicates.append((suffix, attribute, value))
 
-def match_filters(obj, filter_group):
-    for suffix, category_filters in filter_group.items():
-        operator = FILTER_OPS[suffix]
+    predicates.sort(key=lambda p: _FILTER_RANK[p[0]])
+    return tuple(
+        (FILTER_OPS[suffix], attr, value) for suffix, attr, value in predicates
+    )
 
-        for k, v in category_filters.items():
-            if not operator(getattr(obj, k, None), v):
-                return False
+
+def match_filters(obj, predicates):
+    for op, attribute, value in predicates:
+        if not op(getattr(obj, attribute, None), value):
+            return False
 
     return True
+
+
+VECTORIZED_OPS = (
+    operator.eq,
+    operator.ne,
+    operator.gt,
+    operator.lt,
+    operator.ge,
+    operator.le,
+)
+"""Filter operators which can be evaluated over numpy arrays."""
+
+
+_MAX_EXACT_FLOAT = 2**53
+"""Integers from this magnitude on can't be represented exactly as float64."""
+
+_INT_RANGES = {"i": (-(2**63), 2**63), "u": (0, 2**64)}
+
+
+def _compares_exactly(column, value):
+    """
+    Whether numpy compares a column with a value as Python does. Mixing integers
+    and floats casts both to float64, which only holds integers exactly below
+    2**53, and integers out of the column range are cast as well.
+    """
+    kind = column.dtype.kind
+
+    if kind in "iu" and isinstance(value, numbers.Integral):
+        low, high = _INT_RANGES[kind]
+        return low <= value < high
+
+    if not abs(value) < _MAX_EXACT_FLOAT:
+        return False
+
+    return kind in "iu" or bool(numpy.abs(column).max() < _MAX_EXACT_FLOAT)
+
+
+def match_filters_vectorized(rows, predicates):
+    """
+    Evaluates numeric predicates over raw rows column by column using numpy.
+
+    Returns:
+        List(int): Indexes of matching rows, or None when numpy is not installed
+            or any predicate can not be vectorized.
+    """
+    if numpy is None:
+        return None
+
+    for op, _, value in predicates:
+        if op not in VECTORIZED_OPS:
+            return None
+
+        if not isinstance(value, numbers.Real) or isinstance(value, bool):
+            return None
+
+    if not rows:
+        return []
+
+    columns = {}
+    mask = numpy.ones(len(rows), dtype=bool)
+
+    for op, attribute, value in predicates:
+        column = columns.get(attribute)
+
+        if column is None:
+            column = numpy.asarray([row.get(attribute) for row in rows])
+
+            if column.dtype.kind not in "iuf":
+                return None
+
+            columns[attribute] = column
+
+        if not _compares_exactly(column, value):
+            return None
+
+        try:
+            mask &= op(column, value)
+        except (OverflowError, TypeError):
+            return None
+
+    return numpy.flatnonzero(mask).tolist()
+
+
+def chunks(iterable, size=BULK_CHUNK_SIZE):
+    """Splits an iterable into lists of at most ``size`` elements."""
+    chunk = []
+
+    for item in iterable:
+        chunk.append(item)
+
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
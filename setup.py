@@ -11,6 +11,12 @@ REQUIREMENTS = [
     'redis',
 ]
 
+EXTRAS_REQUIREMENTS = {
+    'msgpack': ['msgpack'],
+    'numpy': ['numpy'],
+    'orjson': ['orjson'],
+}
+
 TEST_REQUIREMENTS = [
     'flake8',
     'mock',
@@ -53,5 +59,6 @@ setup(name='redis_schematics',
       include_package_data=True,
       zip_safe=False,
       install_requires=REQUIREMENTS,
+      extras_require=EXTRAS_REQUIREMENTS,
       test_suite='tests',
       tests_require=TEST_REQUIREMENTS+REQUIREMENTS)
@@ -0,0 +1,22 @@
+# encoding: utf8
+
+from __future__ import absolute_import
+
+import pytest
+from redis import ConnectionPool, StrictRedis
+
+pool = ConnectionPool(
+    host="localhost",
+    port=6379,
+    db=4,
+    max_connections=32,
+    socket_keepalive=True,
+    decode_responses=False,
+)
+client = StrictRedis(connection_pool=pool)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def redis_pool():
+    yield pool
+    pool.disconnect()
@@ -3,17 +3,38 @@
 from __future__ import absolute_import
 
 import json
+import math
 from datetime import datetime
-from unittest import TestCase
+from unittest import TestCase, mock, skipIf
 
-from redis import StrictRedis
 from schematics import types, models
 
 from redis_schematics import HashRedisMixin, SimpleRedisMixin
-from redis_schematics.exceptions import NotFound
+from redis_schematics.client import configure_pool
+from redis_schematics.exceptions import NotFound, StrictPerformanceException
+from redis_schematics.serializers import (
+    json_deserializer,
+    json_serializer,
+    msgpack,
+    msgpack_deserializer,
+    msgpack_serializer,
+    orjson_deserializer,
+    orjson_serializer,
+)
+from redis_schematics.utils import group_filters_by_suffix, numpy
 
+from .conftest import client
 
-client = StrictRedis(host="localhost", port=6379, db=4)
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover
+    orjson = None
+    _loads = json.loads
+
+
+FIXED_DT = datetime(2024, 1, 1, 12, 0, 0)
 
 
 class TestModel(models.Model):
@@ -27,44 +48,203 @@ class TestModel(models.Model):
     good_number = types.IntType()
 
 
+class ConfigurePoolTest(TestCase):
+    def test_configure_pool(self):
+        pooled = configure_pool("redis://localhost:6379/4", max_connections=2)
+        self.addCleanup(pooled.connection_pool.disconnect)
+
+        assert pooled.connection_pool.max_connections == 2
+        assert pooled.ping()
+
+
+class SerializersTest(TestCase):
+    def test_json_serializer(self):
+        dump = json_serializer({"big": 2**64, "nan": float("nan")})
+        assert isinstance(dump, str)
+
+        data = json_deserializer(dump)
+        assert data["big"] == 2**64
+        assert math.isnan(data["nan"])
+
+    def test_json_serializer_on_model(self):
+        class TestFloatModel(models.Model, SimpleRedisMixin):
+            __redis_client__ = client
+
+            pk = types.StringType()
+            ratio = types.FloatType()
+            big = types.IntType()
+
+        self.addCleanup(TestFloatModel.delete_all)
+        TestFloatModel({"pk": "1", "ratio": float("nan"), "big": 2**64}).set()
+
+        result = TestFloatModel.match_for_pk("1")
+        assert math.isnan(result.ratio)
+        assert result.big == 2**64
+
+    @skipIf(orjson is None, "orjson is not installed")
+    def test_orjson_serializer_on_big_ints(self):
+        dump = orjson_serializer({"big": 2**64, "small": 1})
+        assert isinstance(dump, bytes)
+        assert orjson_deserializer(dump) == {"big": 2**64, "small": 1}
+
+    @skipIf(orjson is None, "orjson is not installed")
+    def test_orjson_deserializer_on_stdlib_json(self):
+        dump = json.dumps({"nan": float("nan"), "inf": float("inf")}).encode()
+        data = orjson_deserializer(dump)
+        assert math.isnan(data["nan"])
+        assert data["inf"] == float("inf")
+
+
+class GroupFiltersTest(TestCase):
+    def test_group_filters_by_suffix_cached(self):
+        predicates = group_filters_by_suffix({"name": "Bar", "id__gt": 1})
+        assert group_filters_by_suffix({"id__gt": 1, "name": "Bar"}) is predicates
+        assert [p[1:] for p in predicates] == [("name", "Bar"), ("id", 1)]
+
+    def test_group_filters_by_suffix_unhashable(self):
+        predicates = group_filters_by_suffix({"id__in": [1, 2]})
+        assert [p[1:] for p in predicates] == [("id", [1, 2])]
+
+
 class BaseModelStorageTest(object):
+    TestModel = None
+
+    fixture_key = None
+    """Key the fixture is stored on."""
+
+    set_key = None
+    """Hash holding the fixture, for hash models."""
+
+    _stored = None
+    """Parsed fixture payload, cached per test."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.schema = cls.TestModel(
+            {
+                "pk": "123",
+                "id": 123,
+                "name": "Bar",
+                "created": FIXED_DT,
+                "good_number": 42,
+            }
+        )
+        cls.expected = cls.schema.to_primitive()
+        cls.fixture_bytes = cls.TestModel.__serializer__(cls.expected)
+
+    def setUp(self):
+        self._store_fixture()
+
+    def tearDown(self):
+        client.delete(self.set_key or self.fixture_key)
+
+    def _read_raw(self, conn):
+        if self.set_key:
+            return conn.hget(self.set_key, self.fixture_key)
+
+        return conn.get(self.fixture_key)
+
     @property
     def raw_value(self):
-        raise NotImplementedError()
+        return self._read_raw(client)
+
+    def _store_fixture(self):
+        """Stores the fixture and reads it back on a single round trip, so
+        ``stored`` needs no further reads."""
+        pipe = client.pipeline(transaction=False)
+        self.schema.set(pipe=pipe)
+        self._read_raw(pipe)
+        self._stored = self.decode(pipe.execute()[-1])
+
+    def assert_none_match(self, *queries):
+        """Asserts no stored object matches any query. Queries by primary key
+        only are checked together on a single round trip."""
+        pks = [query["pk"] for query in queries if list(query) == ["pk"]]
+        assert self.TestModel.match_for_pks(pks) == [None] * len(pks)
+
+        for query in queries:
+            if list(query) != ["pk"]:
+                self.assertRaises(NotFound, self.TestModel.match, **query)
 
     @property
     def stored(self):
-        raise NotImplementedError()
+        """Payload stored for the fixture, parsed once per test."""
+        if self._stored is None:
+            self._stored = self.decode(self.raw_value)
+
+        return self._stored
+
+    @staticmethod
+    def decode(raw):
+        return _loads(raw)
 
     def test_set(self):
-        assert self.stored == self.schema.to_primitive()
+        assert self.stored == self.expected
 
-    def test_match(self):
-        result = self.TestModel.match(id=123)
-        assert self.stored == result.to_primitive()
+    def test_set_on_pipeline(self):
+        self.schema.delete()
 
-        result = self.TestModel.match(pk="123")
-        assert self.stored == result.to_primitive()
+        pipe = client.pipeline(transaction=False)
+        self.schema.set(pipe=pipe)
+        assert self.raw_value is None
 
-        result = self.TestModel.match(good_number=42)
-        assert self.stored == result.to_primitive()
+        pipe.execute()
+        assert self.decode(self.raw_value) == self.expected
 
-        result = self.TestModel.match(good_number__lt=43)
-        assert self.stored == result.to_primitive()
+    def test_set_raw(self):
+        self.schema.delete()
+        self.TestModel.set_raw("123", self.fixture_bytes)
+        assert self.TestModel.match_for_pk("123").to_primitive() == self.expected
 
-        result = self.TestModel.match(good_number__gt=41)
-        assert self.stored == result.to_primitive()
+    def test_set_without_pk(self):
+        self.addCleanup(self.TestModel.delete_all)
+
+        first = self.TestModel({"name": "Anonymous"})
+        first.set()
+        second = self.TestModel({"name": "Anonymous"})
+        second.set()
+
+        assert first.pk != second.pk
+        assert len(self.TestModel._all_keys()) == 3
+
+    def test_set_many(self):
+        self.addCleanup(self.TestModel.delete_all)
+
+        objs = [self.TestModel({"id": 1000 + i, "good_number": i}) for i in range(10)]
+        self.TestModel.set_many(objs)
+
+        result = self.TestModel.match_for_pks([obj.pk for obj in objs])
+        assert [r.to_primitive() for r in result] == [o.to_primitive() for o in objs]
+
+    def test_match(self):
+        expected = self.stored
+
+        for query in [
+            {"id": 123},
+            {"pk": "123"},
+            {"good_number": 42},
+            {"good_number__lt": 43},
+            {"good_number__gt": 41},
+        ]:
+            assert expected == self.TestModel.match(**query).to_primitive()
 
     def test_match_on_non_existing(self):
-        self.assertRaises(NotFound, self.TestModel.match, id=321)
-        self.assertRaises(NotFound, self.TestModel.match, pk="321")
-        self.assertRaises(NotFound, self.TestModel.match, good_number__gt=42)
-        self.assertRaises(NotFound, self.TestModel.match, good_number__lt=42)
+        self.assert_none_match(
+            {"id": 321}, {"pk": "321"}, {"good_number__gt": 42}, {"good_number__lt": 42}
+        )
 
     def test_match_for_pk(self):
         result = self.TestModel.match_for_pk("123")
         assert self.stored == result.to_primitive()
 
+    def test_match_for_pks(self):
+        result = self.TestModel.match_for_pks(["123", "321"])
+        assert self.stored == result[0].to_primitive()
+        assert result[1] is None
+
+    def test_match_for_pks_on_empty(self):
+        assert self.TestModel.match_for_pks([]) == []
+
     def test_match_for_values(self):
         result = self.TestModel.match_for_values(name="Bar")
         assert self.stored == result.to_primitive()
@@ -73,6 +253,14 @@ class BaseModelStorageTest(object):
         result = self.TestModel.all()
         assert self.stored == result[0].to_primitive()
 
+    def test_all_many(self):
+        self.addCleanup(self.TestModel.delete_all)
+
+        for i in range(100):
+            self.TestModel({"id": 1000 + i, "good_number": i}).set()
+
+        assert len(self.TestModel.all()) == 101
+
     def test_all_on_non_existing(self):
         self.schema.delete()
         result = self.TestModel.all()
@@ -84,6 +272,61 @@ class BaseModelStorageTest(object):
         result = self.TestModel.filter(good_number__lt=42)
         assert result == []
 
+    def test_filter_operators(self):
+        for query in [
+            {"name": "Bar", "good_number": 42},
+            {"name__eq": "Bar"},
+            {"name__not": "Bla"},
+            {"good_number__gte": 42, "good_number__lte": 42},
+            {"good_number__in": [41, 42]},
+            {"good_number__exclude": [41, 43]},
+        ]:
+            result = self.TestModel.filter(**query)
+            assert [self.stored] == [r.to_primitive() for r in result]
+
+        for query in [
+            {"name": "Bar", "good_number": 41},
+            {"name__not": "Bar"},
+            {"good_number__gte": 43},
+            {"good_number__lte": 41},
+            {"good_number__in": [41, 43]},
+            {"good_number__exclude": [42]},
+        ]:
+            assert self.TestModel.filter(**query) == []
+
+    @skipIf(numpy is None, "numpy is not installed")
+    def test_filter_imports_only_matches(self):
+        self.addCleanup(self.TestModel.delete_all)
+        self.TestModel.set_many(
+            [self.TestModel({"id": i, "good_number": i}) for i in range(1, 11)]
+        )
+
+        with mock.patch.object(
+            self.TestModel,
+            "import_data",
+            autospec=True,
+            side_effect=models.Model.import_data,
+        ) as import_data:
+            result = self.TestModel.filter(good_number__gte=8, good_number__lte=9)
+
+        assert sorted(r.id for r in result) == [8, 9]
+        assert import_data.call_count == 2
+
+    def test_filter_on_big_numbers(self):
+        self.addCleanup(self.TestModel.delete_all)
+        big = 2**53 + 1
+        self.TestModel({"id": 321, "good_number": big}).set()
+
+        result = self.TestModel.filter(good_number__gt=2.0**53)
+        assert [r.good_number for r in result] == [big]
+
+    def test_filter_with_missing_numbers(self):
+        self.addCleanup(self.TestModel.delete_all)
+        self.TestModel({"id": 321, "name": "Bla"}).set()
+
+        result = self.TestModel.filter(good_number=42)
+        assert [self.stored] == [r.to_primitive() for r in result]
+
     def test_delete(self):
         self.schema.delete()
         assert self.raw_value is None
@@ -103,11 +346,44 @@ class BaseModelStorageTest(object):
         assert self.TestModel.delete_filter(name="Bar") == 1
         assert self.raw_value is None
 
+    def test_delete_filter_many(self):
+        self.addCleanup(self.TestModel.delete_all)
+
+        for i in range(600):
+            self.TestModel({"id": 1000 + i, "name": "Many"}).set()
+
+        assert self.TestModel.delete_filter(name="Many") == 600
+        assert self.raw_value
+
     def test_delete_filter_on_non_existing(self):
         self.schema.delete()
         assert self.TestModel.delete_filter() == 0
         assert self.raw_value is None
 
+    def test_trusted_source_on_bulk_reads(self):
+        class TestTrustedModel(self.TestModel):
+            __trusted_source__ = True
+
+        self.addCleanup(TestTrustedModel.delete_all)
+        schema = TestTrustedModel({"id": 321, "name": "Bar", "created": FIXED_DT})
+        schema.set()
+
+        with mock.patch.object(TestTrustedModel, "import_data") as import_data:
+            result = TestTrustedModel.match_for_pks(["321"])
+            TestTrustedModel.refresh_many(result)
+
+        assert not import_data.called
+        assert result[0].to_primitive() == schema.to_primitive()
+
+    def test_refresh_many(self):
+        schema = self.TestModel({"id": 123})
+        self.TestModel.refresh_many([schema])
+        assert self.stored == schema.to_primitive()
+
+    def test_refresh_many_on_non_existing(self):
+        self.schema.delete()
+        self.assertRaises(NotFound, self.TestModel.refresh_many, [self.schema])
+
     def test_json_serialization(self):
         from redis_schematics.patches import patch_json
 
@@ -117,54 +393,174 @@ class BaseModelStorageTest(object):
         expected = json.dumps([x.to_primitive() for x in data])
         assert data_json == expected
 
-    def tearDown(self):
-        client.delete("TestSimpleModel:123")
+    def test_json_default(self):
+        from redis_schematics.patches import json_default
+
+        data = self.TestModel.all()
+        data_json = json.dumps(data, default=json_default)
+        expected = json.dumps([x.to_primitive() for x in data])
+        assert data_json == expected
+
+    @skipIf(orjson is None, "orjson is not installed")
+    def test_orjson_default(self):
+        from redis_schematics.patches import json_default
+
+        data = self.TestModel.all()
+        data_json = orjson.dumps(data, default=json_default)
+        expected = orjson.dumps([x.to_primitive() for x in data])
+        assert data_json == expected
+
+    def test_json_dumps(self):
+        from redis_schematics.patches import json_dumps
+
+        data = self.TestModel.all()
+        data_json = json_dumps(data)
+        assert isinstance(data_json, bytes)
+        assert json.loads(data_json) == [x.to_primitive() for x in data]
 
 
 class SimpleModelStorageTest(BaseModelStorageTest, TestCase):
     class TestSimpleModel(TestModel, SimpleRedisMixin):
         pass
 
-    def setUp(self):
-        self.TestModel = self.TestSimpleModel
-        self.schema = self.TestModel(
-            {"id": 123, "name": "Bar", "created": datetime.now(), "good_number": 42}
+    TestModel = TestSimpleModel
+    fixture_key = "TestSimpleModel:123"
+
+    def test_delete_all_on_strict_performance(self):
+        class TestStrictModel(TestModel, SimpleRedisMixin):
+            __strict_performance__ = True
+
+        TestStrictModel.set_many([TestStrictModel({"id": i}) for i in range(1, 31)])
+
+        with mock.patch.object(client, "keys") as keys:
+            assert TestStrictModel.delete_all() == 30
+
+        assert not keys.called
+
+    def test_trusted_source(self):
+        class TestTrustedModel(TestModel, SimpleRedisMixin):
+            __trusted_source__ = True
+
+        schema = TestTrustedModel(
+            {"id": 321, "name": "Bar", "created": datetime.now(), "good_number": 42}
         )
-        self.schema.set()
+        schema.set()
+        self.addCleanup(schema.delete)
 
-    def tearDown(self):
-        client.delete("TestSimpleModel:123")
+        result = TestTrustedModel.match_for_pk("321")
+        assert result.created == schema.created
+        assert result.to_primitive() == schema.to_primitive()
 
-    @property
-    def raw_value(self):
-        return client.get("TestSimpleModel:123")
+        client.set(schema.key, json.dumps({"id": 321, "name": "Bla"}))
+        result.refresh()
+        assert result.name == "Bla"
 
-    @property
-    def stored(self):
-        return json.loads(self.raw_value.decode("utf-8"))
+    def test_cluster_hashtag(self):
+        class TestTaggedModel(TestModel, SimpleRedisMixin):
+            __cluster_hashtag__ = True
+
+        schema = TestTaggedModel({"id": 321})
+        schema.set()
+        self.addCleanup(TestTaggedModel.delete_all)
+
+        assert schema.key == "{TestTaggedModel}:321"
+        assert client.get("{TestTaggedModel}:321")
+        assert [r.pk for r in TestTaggedModel.all()] == ["321"]
+
+    def test_all_with_custom_prefix(self):
+        class TestPrefixedModel(TestModel, SimpleRedisMixin):
+            @property
+            def __prefix__(self):
+                return "Prefixed"
+
+        schema = TestPrefixedModel({"id": 321})
+        schema.set()
+        self.addCleanup(schema.delete)
+
+        assert client.get("Prefixed:321")
+        result = TestPrefixedModel.all()
+        assert [r.to_primitive() for r in result] == [schema.to_primitive()]
+
+        result = TestPrefixedModel.match_for_pks(["321", "123"])
+        assert result[0].to_primitive() == schema.to_primitive()
+        assert result[1] is None
+
+        self.assertRaises(TypeError, TestPrefixedModel._make_key, "321")
 
 
 class HashModelStorageTest(BaseModelStorageTest, TestCase):
     class TestHashModel(TestModel, HashRedisMixin):
         pass
 
-    def setUp(self):
-        self.TestModel = self.TestHashModel
-        self.schema = self.TestModel(
-            {"id": 123, "name": "Bar", "created": datetime.now(), "good_number": 42}
-        )
-        self.schema.set()
+    TestModel = TestHashModel
+    fixture_key = "TestHashModel:123"
+    set_key = "TestHashModel"
 
-    def tearDown(self):
-        client.delete("TestHashModel")
+    def test_all_over_scan_pages(self):
+        self.addCleanup(self.TestModel.delete_all)
+        self.TestModel.set_many([self.TestModel({"id": 1000 + i}) for i in range(300)])
 
-    @property
-    def raw_value(self):
-        return client.hget("TestHashModel", "TestHashModel:123")
+        with mock.patch.object(client, "hscan", wraps=client.hscan) as hscan:
+            result = self.TestModel.all(chunk_size=10)
 
-    @property
-    def stored(self):
-        return json.loads(self.raw_value.decode("utf-8"))
+        assert hscan.call_count > 1
+        assert len(result) == 301
+        assert len(set(r.pk for r in result)) == 301
+
+    def test_all_on_single_round_trip(self):
+        with mock.patch.object(client, "hscan") as hscan:
+            result = self.TestModel.all(chunk_size=None)
+
+        hscan.assert_not_called()
+        assert [r.to_primitive() for r in result] == [self.stored]
+
+    def test_cluster_hashtag(self):
+        class TestTaggedModel(TestModel, HashRedisMixin):
+            __cluster_hashtag__ = True
+
+        schema = TestTaggedModel({"id": 321})
+        schema.set()
+        self.addCleanup(TestTaggedModel.delete_all)
+
+        assert client.hget("{TestTaggedModel}", "{TestTaggedModel}:321")
+        assert [r.pk for r in TestTaggedModel.all()] == ["321"]
+
+    def test_all_on_strict_performance(self):
+        class TestStrictModel(TestModel, HashRedisMixin):
+            __strict_performance__ = True
+
+        self.assertRaises(StrictPerformanceException, TestStrictModel.all)
+
+    def test_all_over_max_bulk(self):
+        class TestBulkModel(TestModel, HashRedisMixin):
+            __max_bulk__ = 1
+
+        self.addCleanup(TestBulkModel.delete_all)
+        TestBulkModel.set_many([TestBulkModel({"id": 1}), TestBulkModel({"id": 2})])
+
+        self.assertRaises(StrictPerformanceException, TestBulkModel.all)
+        self.assertRaises(StrictPerformanceException, TestBulkModel.filter, id=1)
+
+        TestBulkModel.__max_bulk__ = 2
+        assert len(TestBulkModel.all()) == 2
+
+    def test_delete_all_unlinks(self):
+        with mock.patch.object(client, "unlink", wraps=client.unlink) as unlink:
+            self.TestModel.delete_all()
+
+        unlink.assert_called_once_with("TestHashModel")
+        assert self.raw_value is None
+
+    def test_set_without_expire(self):
+        class TestPersistentModel(TestModel, HashRedisMixin):
+            __expire__ = None
+
+        schema = TestPersistentModel({"id": 123})
+        schema.set()
+        self.addCleanup(TestPersistentModel.delete_all)
+
+        assert client.hget("TestPersistentModel", "TestPersistentModel:123")
+        assert client.ttl("TestPersistentModel") == -1
 
 
 class HashModelDynamicKeyStorageTest(BaseModelStorageTest, TestCase):
@@ -175,20 +571,38 @@ class HashModelDynamicKeyStorageTest(BaseModelStorageTest, TestCase):
         def __set_key__(self):
             return self.__key_pattern__(self.hash_id)
 
-    def setUp(self):
-        self.TestModel = self.TestHashModel
-        self.schema = self.TestModel(
-            {"id": 123, "name": "Bar", "created": datetime.now(), "good_number": 42}
-        )
-        self.schema.set()
+    TestModel = TestHashModel
+    fixture_key = "TestHashModel:123"
+    set_key = "TestHashModel:SubKey"
 
-    def tearDown(self):
-        client.delete("TestHashModel:SubKey")
 
-    @property
-    def raw_value(self):
-        return client.hget("TestHashModel:SubKey", "TestHashModel:123")
+@skipIf(orjson is None, "orjson is not installed")
+class OrjsonModelStorageTest(BaseModelStorageTest, TestCase):
+    class TestOrjsonModel(TestModel, SimpleRedisMixin):
+        __serializer__ = staticmethod(orjson_serializer)
+        __deserializer__ = staticmethod(orjson_deserializer)
 
-    @property
-    def stored(self):
-        return json.loads(self.raw_value.decode("utf-8"))
+    TestModel = TestOrjsonModel
+    fixture_key = "TestOrjsonModel:123"
+
+    def test_match_on_stdlib_json(self):
+        client.set("TestOrjsonModel:123", json.dumps({"id": 123, "name": "Json"}))
+        assert self.TestModel.match_for_pk("123").name == "Json"
+
+
+@skipIf(msgpack is None, "msgpack is not installed")
+class MsgpackModelStorageTest(BaseModelStorageTest, TestCase):
+    class TestMsgpackModel(TestModel, SimpleRedisMixin):
+        __serializer__ = staticmethod(msgpack_serializer)
+        __deserializer__ = staticmethod(msgpack_deserializer)
+
+    TestModel = TestMsgpackModel
+    fixture_key = "TestMsgpackModel:123"
+
+    @staticmethod
+    def decode(raw):
+        return msgpack.unpackb(raw, raw=False)
+
+    def test_match_on_json(self):
+        client.set("TestMsgpackModel:123", json.dumps({"id": 123, "name": "Json"}))
+        assert self.TestModel.match_for_pk("123").name == "Json"